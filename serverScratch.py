@@ -1,5 +1,88 @@
 # we want, raw upload, raw upload from calculated filter, and PID upload.
 
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import miniconf
+from aiomqtt import MqttError
+
+# -----------------------------------------------------------------------------
+# Shared broker connection
+# -----------------------------------------------------------------------------
+
+_dev = None
+_dev_stack = None
+_dev_loop = None
+_dev_lock = None
+
+# Errors that mean the broker connection itself is gone. Device-side
+# errors (e.g. a rejected value) leave the connection usable.
+_TRANSPORT_ERRORS = (MqttError, OSError)
+
+
+async def get_dev():
+    """
+    Return the shared Miniconf interface to the stabilizer.
+
+    The MQTT connection is opened on first use and reused by every helper
+    below, so each call costs one request/response instead of a full
+    connect handshake. The client is bound to the event loop that created
+    it, so a new `asyncio.run(...)` gets a fresh connection.
+    """
+    global _dev, _dev_stack, _dev_loop, _dev_lock
+
+    loop = asyncio.get_running_loop()
+    if _dev_loop is not loop:
+        # The previous loop is closed; its client cannot be reused or closed
+        _dev = _dev_stack = None
+        _dev_lock = asyncio.Lock()
+        _dev_loop = loop
+
+    async with _dev_lock:
+        if _dev is None:
+            _dev_stack = AsyncExitStack()
+            client = await _dev_stack.enter_async_context(
+                miniconf.Client(broker, protocol=miniconf.MQTTv5)
+            )
+            _dev = miniconf.Miniconf(client, prefix)
+        return _dev
+
+
+async def close_dev():
+    """
+    Close the shared broker connection. Call once at shutdown.
+    """
+    global _dev, _dev_stack
+
+    if _dev_loop is not asyncio.get_running_loop():
+        return
+
+    async with _dev_lock:
+        stack, _dev, _dev_stack = _dev_stack, None, None
+        if stack is not None:
+            try:
+                await stack.aclose()
+            except _TRANSPORT_ERRORS:
+                # The connection may already be dead; it is dropped either way
+                pass
+
+
+@asynccontextmanager
+async def shared_dev():
+    """
+    Use the shared Miniconf interface for one operation.
+
+    If the broker connection fails, it is dropped so that the next call
+    reconnects instead of reusing a dead client.
+    """
+    dev = await get_dev()
+    try:
+        yield dev
+    except _TRANSPORT_ERRORS:
+        await close_dev()
+        raise
+
+
 # -----------------------------------------------------------------------------
 # Raw biquad filter support (direct coefficient upload, no filter calculation)
 # -----------------------------------------------------------------------------
@@ -47,7 +130,7 @@ async def apply_filter(ba, offset=0):
     Apply a Raw biquad filter to the selected channel on the stabilizer.
 
     This function:
-      1. Connects to the stabilizer over MQTT
+      1. Gets the shared MQTT connection to the stabilizer
       2. Forces the biquad type to 'Raw'
       3. Uploads the full Raw representation payload
       4. Starts the channel processing
@@ -60,11 +143,8 @@ async def apply_filter(ba, offset=0):
         Output offset (DAC units). Defaults to 0.
     """
 
-    # Open an asynchronous MQTT connection to the broker
-    async with miniconf.Client(broker, protocol=miniconf.MQTTv5) as client:
-        # Bind the client to the stabilizer's configuration namespace
-        dev = miniconf.Miniconf(client, prefix)
-
+    # Reuse the shared MQTT connection to the stabilizer
+    async with shared_dev() as dev:
         # Explicitly set the biquad filter type to "Raw"
         # This tells the firmware NOT to reinterpret coefficients
         await dev.set(f"/ch/{channel}/biquad/0/typ", "Raw")
@@ -99,8 +179,7 @@ Basically use filter library and then direct ba coefficient upload
 
 
 async def set_stream_target(computer_ip, port=9293):
-    async with miniconf.Client(broker, protocol=miniconf.MQTTv5) as client:
-        dev = miniconf.Miniconf(client, prefix)
+    async with shared_dev() as dev:
         await dev.set("/stream", f"{computer_ip}:{port}")
         print(f"Streaming target set to {computer_ip}:{port}")
 
@@ -113,8 +192,22 @@ async def set_stream_target(computer_ip, port=9293):
 
 
 async def check_filter_type():
-    async with miniconf.Client(broker, protocol=miniconf.MQTTv5) as client:
-        dev = miniconf.Miniconf(client, prefix)
-
+    async with shared_dev() as dev:
         typ = await dev.get(f"/ch/{channel}/biquad/0/typ")
         print("Filter type:", typ)
+
+
+# -----------------------------------------------------------------------------
+# Entry Point
+# -----------------------------------------------------------------------------
+
+
+async def main():
+    try:
+        await check_filter_type()
+    finally:
+        await close_dev()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+Numeric [b0, b1, b2, -a1, -a2] kernels for the server's FilterLibrary.
+
+Generated by tools/precompile_filters.py -- do not edit by hand.
+"""
+
+
+def ba_LP(F0, K):
+    return [
+        float(F0*K/(F0 + 1)),
+        float(F0*K/(F0 + 1)),
+        0.0,
+        float((1 - F0)/(F0 + 1)),
+        0.0,
+    ]
+
+
+def ba_HP(F0, K):
+    return [
+        float(K/(F0 + 1)),
+        float(-K/(F0 + 1)),
+        0.0,
+        float((1 - F0)/(F0 + 1)),
+        0.0,
+    ]
+
+
+def ba_AP(F0, K):
+    return [
+        float((-F0*K + K)/(F0 + 1)),
+        float((-F0*K - K)/(F0 + 1)),
+        0.0,
+        float((1 - F0)/(F0 + 1)),
+        0.0,
+    ]
+
+
+def ba_I(F0, K):
+    return [
+        float(F0*K),
+        float(F0*K),
+        0.0,
+        1.0,
+        0.0,
+    ]
+
+
+def ba_PI(F0, K, g):
+    return [
+        float((F0*K*g + K*g)/(F0 + g)),
+        float((F0*K*g - K*g)/(F0 + g)),
+        0.0,
+        float((-F0 + g)/(F0 + g)),
+        0.0,
+    ]
+
+
+def ba_P(K):
+    return [
+        float(K),
+        0.0,
+        0.0,
+        0.0,
+        0.0,
+    ]
+
+
+def ba_PD(F0, K, g):
+    return [
+        float((F0*K*g + K*g)/(F0*g + 1)),
+        float((F0*K*g - K*g)/(F0*g + 1)),
+        0.0,
+        float((-F0*g + 1)/(F0*g + 1)),
+        0.0,
+    ]
+
+
+# name -> (parameter names, kernel)
+KERNELS = {
+    'LP': (('F0', 'K'), ba_LP),
+    'HP': (('F0', 'K'), ba_HP),
+    'AP': (('F0', 'K'), ba_AP),
+    'I': (('F0', 'K'), ba_I),
+    'PI': (('F0', 'K', 'g'), ba_PI),
+    'P': (('K',), ba_P),
+    'PD': (('F0', 'K', 'g'), ba_PD),
+}
@@ -19,9 +19,9 @@ Dependencies:
 ============================================================
 """
 import logging
-import asyncio
+from collections import defaultdict
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from typing import Self
 
@@ -37,11 +37,10 @@ from pydux.control_support.config_handler import ConfigHandler
 # -----------------------------------------------------------------------------
 # Filter Design
 # -----------------------------------------------------------------------------
-import sympy as sp
-from sympy import pi
 import numpy as np
 from scipy import signal
-from functools import lru_cache
+
+from ._filter_kernels import KERNELS
 
 class StabilizerParameters:
     Ts = 128 / 100e6
@@ -59,45 +58,14 @@ class StabilizerParameters:
         return val * cls.volt_per_lsb
 
 class FilterLibrary:
-    Ts = sp.symbols("Ts")
-    q, s = sp.symbols("q s")
-    K, g, f0, F0, Q = sp.symbols("K g f0 F0 Q")
-
-    library = {
-        "LP": K / (1 + s / (2 * pi * f0)),
-        "HP": K / (1 + 2 * pi * f0 / s),
-        "AP": K * (s / (2 * pi * f0) - 1) / (s / (2 * pi * f0) + 1),
-        "I": K * 2 * pi * f0 / s,
-        "PI": K * (1 + s / (2 * pi * f0)) / (1 / g + s / (2 * pi * f0)),
-        "P": K,
-        "PD": K * (1 + s / (2 * pi * f0)) / (1 + s / (2 * pi * f0 * g)),
-    }
-
-    names = list(library.keys())
-
-    @classmethod
-    @lru_cache
-    def get_ba_sym(cls, name):
-        H = cls.library[name]
-        Hq = (
-            H.subs({cls.s: 2 / cls.Ts * (1 - cls.q) / (1 + cls.q)})
-            .subs({pi * cls.f0 * cls.Ts: cls.F0})
-            .simplify()
-        )
-        b, a = [expr.expand().collect(cls.q) for expr in sp.fraction(Hq)]
-        a0 = a.coeff(cls.q, 0)
-        a_coeffs = [-a.coeff(cls.q, n)/a0 for n in range(1,3)]
-        b_coeffs = [b.coeff(cls.q, n)/a0 for n in range(3)]
-        return b_coeffs + a_coeffs
+    # Kernels are generated offline from the symbolic transfer functions
+    # by tools/precompile_filters.py; no sympy is needed at runtime.
+    names = list(KERNELS)
 
     @classmethod
     def get_ba(cls, name, **params):
-        ba = cls.get_ba_sym(name)
-        if "Ts" not in params:
-            params["Ts"] = StabilizerParameters.Ts
-        syms = set.union(*(expr.free_symbols for expr in ba))
-        p = {s: params[str(s)] for s in syms}
-        return [float(expr.evalf(subs=p)) for expr in ba]
+        args, kernel = KERNELS[name]
+        return kernel(*(params[arg] for arg in args))
 
 # -----------------------------------------------------------------------------
 # Logger
@@ -113,6 +81,60 @@ class SinaraStabilizerConfig:
     prefix: str
     channel: int
 
+# -----------------------------------------------------------------------------
+# Task groups
+# -----------------------------------------------------------------------------
+@contextmanager
+def _unwrap_task_group_errors():
+    # Task groups raise ExceptionGroup; callers expect the original error
+    try:
+        yield
+    except ExceptionGroup as eg:
+        for exc in eg.exceptions[1:]:
+            logger.error("Additional task group error", exc_info=exc)
+        raise eg.exceptions[0] from None
+
+# -----------------------------------------------------------------------------
+# Shared Miniconf connections
+# -----------------------------------------------------------------------------
+@dataclass(slots=True)
+class _PooledMiniconf:
+    stack: AsyncExitStack
+    dev: Miniconf
+    users: int = 0
+
+# Servers targeting the same stabilizer on the same broker share one
+# connection; it is closed when the last of them exits. Locks are per key
+# so connects to different stabilizers/brokers run in parallel.
+_MINICONF_POOL: dict[tuple[str, str], _PooledMiniconf] = {}
+_MINICONF_LOCKS: defaultdict[tuple[str, str], anyio.Lock] = defaultdict(anyio.Lock)
+
+async def _acquire_miniconf(broker: str, prefix: str) -> _PooledMiniconf:
+    key = (broker, prefix)
+    async with _MINICONF_LOCKS[key]:
+        entry = _MINICONF_POOL.get(key)
+        if entry is None:
+            async with AsyncExitStack() as stack:
+                client = await stack.enter_async_context(
+                    miniconf.Client(broker, protocol=miniconf.MQTTv5)
+                )
+                dev = Miniconf(client, prefix)
+                # Stop the Miniconf listener before its client goes away
+                stack.push_async_callback(dev.close)
+                entry = _PooledMiniconf(stack=stack.pop_all(), dev=dev)
+            _MINICONF_POOL[key] = entry
+        entry.users += 1
+        return entry
+
+async def _release_miniconf(broker: str, prefix: str) -> None:
+    key = (broker, prefix)
+    async with _MINICONF_LOCKS[key]:
+        entry = _MINICONF_POOL[key]
+        entry.users -= 1
+        if entry.users == 0:
+            del _MINICONF_POOL[key]
+            await entry.stack.aclose()
+
 # -----------------------------------------------------------------------------
 # Server
 # -----------------------------------------------------------------------------
@@ -120,28 +142,60 @@ class SinaraStabilizerServer(RPCNamespace, AsyncContextManagerMixin):
     def __init__(self, parameters_file: str, config: SinaraStabilizerConfig):
         super().__init__()
         self.config = config
+        ch = f"/ch/{config.channel}"
+        biquad = f"{ch}/biquad/0"
+        self._run_path = f"{ch}/run"
+        self._typ_path = f"{biquad}/typ"
+        self._raw_path = f"{biquad}/repr/Raw"
+        self._pid_leaf_paths = tuple(
+            f"{biquad}/repr/Pid/{leaf}"
+            for leaf in ("gain/p", "gain/i", "gain/d", "min", "max", "setpoint", "limit/i")
+        )
         self.config_handler = ConfigHandler(
             ["servers", "sinara_stabilizer", parameters_file]
         )
         self.parameters = {}
+        self._dirty = False
         self._connected = False
+        self._conn: _PooledMiniconf | None = None
         self._dev: Miniconf | None = None
+        # Serializes every device-write sequence on this channel
+        self._write_lock = anyio.Lock()
+        self._pending_pid: list[tuple[str, float | int]] | None = None
+        self._pid_wakeup = anyio.Event()
 
     # Lifecycle
     @asynccontextmanager
     async def __asynccontextmanager__(self) -> AsyncGenerator[Self]:
-        await self._load_config()
         try:
-            async with miniconf.Client(self.config.broker, protocol=miniconf.MQTTv5) as client:
-                self._dev = Miniconf(client, self.config.prefix)
-                self._connected = True
-                await self.send_signal("all", "on_connection_state", True)
-                yield self
+            # Config load (disk) and broker connect are independent
+            with _unwrap_task_group_errors():
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(self._load_config)
+                    tg.start_soon(self._connect)
+            self._connected = True
+            await self.send_signal("all", "on_connection_state", True)
+            with _unwrap_task_group_errors():
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(self._pid_worker)
+                    yield self
+                    tg.cancel_scope.cancel()
         finally:
             self._connected = False
             await self.send_signal("all", "on_connection_state", False)
             with CancelScope(shield=True):
-                await self.config_handler.save(self.parameters)
+                if self._dev is not None:
+                    # Apply a GUI update that was accepted but not yet sent
+                    await self._flush_pid()
+                if self._conn is not None:
+                    self._conn = self._dev = None
+                    await _release_miniconf(self.config.broker, self.config.prefix)
+                if self._dirty:
+                    await self.config_handler.save(self.parameters)
+
+    async def _connect(self):
+        self._conn = await _acquire_miniconf(self.config.broker, self.config.prefix)
+        self._dev = self._conn.dev
 
     # Utilities
     def _make_raw_payload(self, ba, offset=0):
@@ -152,36 +206,55 @@ class SinaraStabilizerServer(RPCNamespace, AsyncContextManagerMixin):
             "max": int(self.parameters["high_voltage_limit"]),
         }
 
-    def _make_pid_payload(self, kp, ki, kd, setpoint, preload):
-        return {
-            "kp": float(kp),
-            "ki": float(ki),
-            "kd": float(kd),
-            "setpoint": float(setpoint),
-            "u": float(preload),
-            "min": int(self.parameters["low_voltage_limit"]),
-            "max": int(self.parameters["high_voltage_limit"]),
-        }
+    def _make_pid_leaves(self, kp, ki, kd, setpoint, preload):
+        # The firmware deserializes PID settings leaf by leaf
+        return list(zip(self._pid_leaf_paths, (
+            float(kp),
+            float(ki),
+            float(kd),
+            int(self.parameters["low_voltage_limit"]),
+            int(self.parameters["high_voltage_limit"]),
+            float(setpoint),
+            float(preload),
+        )))
+
+    async def _set_all(self, leaves):
+        # Miniconf matches responses by correlation data, so independent
+        # leaf sets can be in flight together: one round-trip, not N.
+        with _unwrap_task_group_errors():
+            async with anyio.create_task_group() as tg:
+                for path, value in leaves:
+                    tg.start_soon(self._dev.set, path, value)
+
+    async def _apply_pid(self, leaves):
+        # Shielded so cancellation cannot leave the channel frozen in Hold
+        with CancelScope(shield=True):
+            await self._dev.set(self._run_path, "Hold")
+            # The repr leaves only exist once typ has been switched
+            await self._dev.set(self._typ_path, "Pid")
+            await self._set_all(leaves)
+            await self._dev.set(self._run_path, "Run")
 
     # ----------------------
     # Raw Filter API
     # ----------------------
     async def apply_raw_filter(self, ba, offset=0):
-        ch = self.config.channel
-        await self._dev.set(f"/ch/{ch}/biquad/0/typ", "Raw")
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Raw", self._make_raw_payload(ba, offset))
-        await self._dev.set(f"/ch/{ch}/run", "Run")
+        async with self._write_lock:
+            # Supersedes any GUI PID update still waiting to be sent
+            self._pending_pid = None
+            await self._dev.set(self._typ_path, "Raw")
+            await self._dev.set(self._raw_path, self._make_raw_payload(ba, offset))
+            await self._dev.set(self._run_path, "Run")
         await self.send_signal("others", "on_raw_filter_applied", ba, offset)
 
     # ----------------------
     # PID API
     # ----------------------
     async def apply_pid(self, kp, ki, kd, setpoint, preload=0):
-        ch = self.config.channel
-        await self._dev.set(f"/ch/{ch}/run", "Hold")
-        await self._dev.set(f"/ch/{ch}/biquad/0/typ", "Pid")
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid", self._make_pid_payload(kp, ki, kd, setpoint, preload))
-        await self._dev.set(f"/ch/{ch}/run", "Run")
+        async with self._write_lock:
+            # Supersedes any GUI PID update still waiting to be sent
+            self._pending_pid = None
+            await self._apply_pid(self._make_pid_leaves(kp, ki, kd, setpoint, preload))
         await self.send_signal("others", "on_pid_applied", kp, ki, kd, setpoint, preload)
 
     # ----------------------
@@ -202,30 +275,38 @@ class SinaraStabilizerServer(RPCNamespace, AsyncContextManagerMixin):
         - Kp, Ki, Kd: controller gains
         - setpoint: target setpoint
         - preload: integrator preload (optional)
-        """
-        ch = self.config.channel
-        await self._dev.set(f"/ch/{ch}/run", "Hold")
-        await self._dev.set(f"/ch/{ch}/biquad/0/typ", "Pid")
 
-        # Gains
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid/gain/p", float(Kp))
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid/gain/i", float(Ki))
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid/gain/d", float(Kd))
-
-        # Limits
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid/min", self.parameters["low_voltage_limit"])
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid/max", self.parameters["high_voltage_limit"])
-
-        # Setpoint
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid/setpoint", float(setpoint))
-
-        # Integrator preload
+        Returns immediately. Parameters are applied in the background at
+        most once per 20 ms, always with the most recent values; clients
+        receive on_pid_enabled on success or on_pid_failed on error.
+        """
         if preload is None:
             preload = 0.0
-        await self._dev.set(f"/ch/{ch}/biquad/0/repr/Pid/limit/i", float(preload))
-
-        await asyncio.sleep(0.05)
-        await self._dev.set(f"/ch/{ch}/run", "Run")
+        self._pending_pid = self._make_pid_leaves(Kp, Ki, Kd, setpoint, preload)
+        self._pid_wakeup.set()
+
+    async def _pid_worker(self):
+        # Throttle: apply at most once per 20 ms, always with the latest values
+        last_sent = float("-inf")
+        while True:
+            await self._pid_wakeup.wait()
+            self._pid_wakeup = anyio.Event()
+            await anyio.sleep(max(0.0, last_sent + 0.02 - anyio.current_time()))
+            last_sent = anyio.current_time()
+            await self._flush_pid()
+
+    async def _flush_pid(self):
+        async with self._write_lock:
+            leaves, self._pending_pid = self._pending_pid, None
+            if leaves is None:
+                # Already sent, or superseded by a direct apply
+                return
+            try:
+                await self._apply_pid(leaves)
+            except Exception as e:
+                logger.exception("Failed to apply PID from GUI")
+                await self.send_signal("all", "on_pid_failed", str(e))
+                return
         await self.send_signal("others", "on_pid_enabled")
 
     # ----------------------
@@ -245,6 +326,7 @@ class SinaraStabilizerServer(RPCNamespace, AsyncContextManagerMixin):
                 "low_voltage_limit": -6553,
                 "high_voltage_limit": 6553,
             }
+            self._dirty = True
 
     # ----------------------
     # Status
@@ -31,6 +31,21 @@ class StabilizerParameters:
     def volt_to_mu(cls, val):
         return int(np.round(val / cls.volt_per_lsb))
 
+    @classmethod
+    def volts_to_mu(cls, vals):
+        """
+        Vectorized `volt_to_mu`: convert an array of voltages to an
+        `np.int32` array of machine units.
+
+        Raises `ValueError` for non-finite values or values outside the
+        `np.int32` range instead of letting the cast wrap.
+        """
+        mu = np.rint(np.asarray(vals, dtype=np.float64) / cls.volt_per_lsb)
+        info = np.iinfo(np.int32)
+        if not np.all(np.isfinite(mu) & (mu >= info.min) & (mu <= info.max)):
+            raise ValueError(f"Voltage out of range: {vals!r}")
+        return mu.astype(np.int32)
+
     @classmethod
     def mu_to_volt(cls, val):
         return val * cls.volt_per_lsb
@@ -0,0 +1,93 @@
+"""
+============================================================
+File: precompile_filters.py
+
+Description:
+    Offline code generator for the server's filter library.
+    Performs the symbolic bilinear transform of every transfer
+    function below once and writes plain-Python numeric kernels
+    to stabilizer_server/_filter_kernels.py, so the server needs
+    no sympy at runtime.
+
+    Re-run after editing `library`:
+        python tools/precompile_filters.py
+
+Dependencies:
+    - sympy
+============================================================
+"""
+from pathlib import Path
+
+import sympy as sp
+from sympy import pi
+
+OUTPUT = Path(__file__).resolve().parent.parent / "stabilizer_server" / "_filter_kernels.py"
+
+Ts = sp.symbols("Ts")
+q, s = sp.symbols("q s")
+K, g, f0, F0, Q = sp.symbols("K g f0 F0 Q")
+
+library = {
+    "LP": K / (1 + s / (2 * pi * f0)),
+    "HP": K / (1 + 2 * pi * f0 / s),
+    "AP": K * (s / (2 * pi * f0) - 1) / (s / (2 * pi * f0) + 1),
+    "I": K * 2 * pi * f0 / s,
+    "PI": K * (1 + s / (2 * pi * f0)) / (1 / g + s / (2 * pi * f0)),
+    "P": K,
+    "PD": K * (1 + s / (2 * pi * f0)) / (1 + s / (2 * pi * f0 * g)),
+}
+
+
+def get_ba_sym(name):
+    """
+    Return [b0, b1, b2, -a1, -a2] in symbolic form for the filter `name`.
+    """
+    H = library[name]
+    Hq = (
+        H.subs({s: 2 / Ts * (1 - q) / (1 + q)})
+        .subs({pi * f0 * Ts: F0})
+        .simplify()
+    )
+    b, a = [expr.expand().collect(q) for expr in sp.fraction(Hq)]
+    a0 = a.coeff(q, 0)
+    a_coeffs = [-a.coeff(q, n) / a0 for n in range(1, 3)]
+    b_coeffs = [b.coeff(q, n) / a0 for n in range(3)]
+    return b_coeffs + a_coeffs
+
+
+def render_kernel(name):
+    ba = get_ba_sym(name)
+    syms = sorted(set.union(*(sp.S(expr).free_symbols for expr in ba)), key=str)
+    args = ", ".join(str(sym) for sym in syms)
+    body = ",\n        ".join(
+        repr(float(expr)) if sp.S(expr).is_number else f"float({sp.pycode(expr)})"
+        for expr in ba
+    )
+    source = f"def ba_{name}({args}):\n    return [\n        {body},\n    ]\n"
+    return tuple(str(sym) for sym in syms), source
+
+
+def render_module():
+    kernels = {name: render_kernel(name) for name in library}
+    lines = [
+        '"""',
+        "Numeric [b0, b1, b2, -a1, -a2] kernels for the server's FilterLibrary.",
+        "",
+        "Generated by tools/precompile_filters.py -- do not edit by hand.",
+        '"""',
+    ]
+    if any("math." in source for _, source in kernels.values()):
+        lines.append("import math")
+    lines.append("")
+    for _, source in kernels.values():
+        lines += ["", source]
+    lines += ["", "# name -> (parameter names, kernel)", "KERNELS = {"]
+    for name, (args, _) in kernels.items():
+        lines.append(f"    {name!r}: ({args!r}, ba_{name}),")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    OUTPUT.write_text(render_module())
+    print(f"Wrote {OUTPUT}")